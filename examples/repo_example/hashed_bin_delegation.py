@@ -18,9 +18,11 @@ NOTE: Metadata files will be written to a 'tmp*'-directory in CWD.
 import hashlib
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Tuple
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
 
 from securesystemslib.keys import generate_ed25519_key
 from securesystemslib.signer import SSlibSigner
@@ -78,6 +80,13 @@ NUMBER_OF_PREFIXES = 16**PREFIX_LEN  # ... 256 prefixes, i.e. 00, 01, ..., ff.
 # over all bins, which allows to calculate the uniform size of ...
 BIN_SIZE = NUMBER_OF_PREFIXES // NUMBER_OF_BINS  # ... 8, where each bin is
 # responsible for a range of 8 prefixes, i.e. 00-07, 08-0f, ..., f8-ff.
+#
+# The helpers below rely on the number of bins being a power of two, so that
+# the bin size is a power of two as well and bin indices can be calculated with
+# bit shifts.
+assert (
+    NUMBER_OF_BINS & (NUMBER_OF_BINS - 1) == 0
+), "NUMBER_OF_BINS must be a power of two"
 
 # Helpers
 # -------
@@ -94,33 +103,93 @@ def _bin_name(low: int, high: int) -> str:
     return f"{low:0{PREFIX_LEN}x}-{high:0{PREFIX_LEN}x}"
 
 
+# There are only as many bin names as there are bins, so we generate them once
+# and look them up by bin index (i.e. hash prefix divided by bin size) below.
+_BIN_NAMES = [
+    _bin_name(low, low + BIN_SIZE - 1)
+    for low in range(0, NUMBER_OF_PREFIXES, BIN_SIZE)
+]
+
+# Likewise, the zero-left-padded hex representations of all hash prefixes are
+# generated once and looked up by numerical value of the prefix below.
+_HASH_PREFIXES = [
+    f"{prefix:0{PREFIX_LEN}x}" for prefix in range(NUMBER_OF_PREFIXES)
+]
+
+# Each byte of a hash digest holds two hex digits. To read the hash prefix from
+# the raw digest we need the number of leading bytes, which cover all prefix
+# digits, and the number of bits to drop if the prefix ends in the middle of a
+# byte (odd prefix length).
+_PREFIX_BYTES = (PREFIX_LEN + 1) // 2
+_PREFIX_SHIFT = (PREFIX_LEN % 2) * 4
+
+# Given the bin size is a power of two, the bin index of a hash prefix is the
+# prefix shifted right by the number of bits needed to count within a bin.
+_LOG2_BIN_SIZE = (BIN_SIZE - 1).bit_length()
+
+# Both shifts are combined to get from the leading digest bytes to the bin index
+# in a single operation.
+_BIN_SHIFT = _PREFIX_SHIFT + _LOG2_BIN_SIZE
+
+
 def generate_hash_bins() -> Iterator[Tuple[str, List[str]]]:
     """Returns generator for bin names and hash prefixes per bin."""
     # Iterate over the total number of hash prefixes in 'bin size'-steps to
-    # generate bin names and a list of hash prefixes served by each bin.
+    # look up bin names and the list of hash prefixes served by each bin, which
+    # is a contiguous slice of all precomputed hash prefixes.
     for low in range(0, NUMBER_OF_PREFIXES, BIN_SIZE):
-        high = low + BIN_SIZE - 1
-        bin_name = _bin_name(low, high)
-        hash_prefixes = []
-        for prefix in range(low, low + BIN_SIZE):
-            hash_prefixes.append(f"{prefix:0{PREFIX_LEN}x}")
-
-        yield bin_name, hash_prefixes
-
-
-def find_hash_bin(path: str) -> str:
-    """Returns name of bin for target file based on the target path hash."""
-    # Generate hash digest of passed target path and take its prefix, given the
-    # global prefix length for the given number of bins.
-    hasher = hashlib.sha256()
-    hasher.update(path.encode("utf-8"))
-    target_name_hash = hasher.hexdigest()
-    prefix = int(target_name_hash[:PREFIX_LEN], 16)
-    # Find lower and upper bounds for hash prefix given its numerical value and
-    # the the general bin size for the given number of bins.
-    low = prefix - (prefix % BIN_SIZE)
-    high = low + BIN_SIZE - 1
-    return _bin_name(low, high)
+        bin_name = _BIN_NAMES[low >> _LOG2_BIN_SIZE]
+        yield bin_name, _HASH_PREFIXES[low : low + BIN_SIZE]
+
+
+def find_hash_bins(paths: Sequence[Union[str, bytes]]) -> List[str]:
+    """Returns names of bins for target files based on the target path hashes.
+
+    Helper to classify many target paths at once, e.g. on bulk ingestion.
+    Target paths may be passed already utf-8 encoded to not encode them again.
+    """
+    # Hash each target path and use the raw digest directly, which saves the
+    # round trip through its hex representation.
+    # NOTE: 'hashlib.sha256' is backed by OpenSSL, if available, which uses
+    # CPU SHA extensions where supported. Most target paths are short enough
+    # to be hashed as a single SHA-256 block.
+    bin_names = []
+    for path in paths:
+        path_bytes = path.encode("utf-8") if isinstance(path, str) else path
+        digest = hashlib.sha256(path_bytes).digest()
+        # Take the prefix of the hash digest, given the global prefix length
+        # for the given number of bins. A prefix of up to two hex digits is just
+        # the first byte of the digest.
+        if _PREFIX_BYTES == 1:
+            prefix = digest[0]
+        else:
+            prefix = int.from_bytes(digest[:_PREFIX_BYTES], "big")
+        # Find the bin for the hash prefix given its numerical value and the
+        # general bin size for the given number of bins.
+        bin_names.append(_BIN_NAMES[prefix >> _BIN_SHIFT])
+
+    return bin_names
+
+
+@lru_cache(maxsize=131072)
+def _find_hash_bin(path: Union[str, bytes]) -> str:
+    """Returns name of bin for hashable target path, caching the result."""
+    return find_hash_bins([path])[0]
+
+
+def find_hash_bin(path: Union[str, bytes]) -> str:
+    """Returns name of bin for target file based on the target path hash.
+
+    Results are cached, because the same target paths are usually looked up
+    repeatedly, e.g. when re-signing or verifying. Bytes-like paths, which are
+    not necessarily hashable (e.g. 'bytearray'), are converted to 'bytes' for
+    the cache lookup. Call '_find_hash_bin.cache_clear()' to release the cache
+    in long-running processes.
+    """
+    if not isinstance(path, str):
+        path = bytes(path)
+
+    return _find_hash_bin(path)
 
 
 # Keys
@@ -161,19 +230,21 @@ roles["bins"].signed.delegations = Delegations(
 #              ...                         ...
 #              f8-ff                       f8 f9 fa fb fc fd fe ff
 assert roles["bins"].signed.delegations.roles is not None
+# All delegated targets roles (bin_n) use the same expiration date.
+bin_n_expires = _in(7)
 for bin_n_name, bin_n_hash_prefixes in generate_hash_bins():
     # Update delegating targets role (bins) with delegation details for each
     # delegated targets role (bin_n).
     roles["bins"].signed.delegations.roles[bin_n_name] = DelegatedRole(
         name=bin_n_name,
-        keyids=[keys["bin-n"]["keyid"]],
+        keyids=[bin_n_key.keyid],
         threshold=1,
         terminating=False,
         path_hash_prefixes=bin_n_hash_prefixes,
     )
 
     # Create delegated targets roles (bin_n)
-    roles[bin_n_name] = Metadata(Targets(expires=_in(7)))
+    roles[bin_n_name] = Metadata(Targets(expires=bin_n_expires))
 
 # Add target file
 # ---------------
@@ -206,11 +277,35 @@ roles[bin_for_target].signed.targets[target_path] = target_file_info
 PRETTY = JSONSerializer(compact=False)
 TMP_DIR = tempfile.mkdtemp(dir=os.getcwd())
 
-for role_name, role in roles.items():
-    key = keys["bins"] if role_name == "bins" else keys["bin-n"]
-    signer = SSlibSigner(key)
-    role.sign(signer)
+# Only two keys are in play, so we create their signers once, instead of once
+# per role.
+signers = {name: SSlibSigner(key) for name, key in keys.items()}
+
+# Delegated targets roles (bin_n) without target files all have the same
+# signed content and are signed with the same key, so their signatures are
+# identical. Thus we sign such an empty bin only once and reuse its signatures
+# for all of them.
+EMPTY_BIN = Metadata(Targets(expires=bin_n_expires))
+EMPTY_BIN.sign(signers["bin-n"])
+
 
+def _sign_and_persist(role_name: str, role: Metadata[Targets]) -> None:
+    """Signs role with the key for its role name and writes it to TMP_DIR."""
     filename = f"1.{role_name}.json"
     filepath = os.path.join(TMP_DIR, filename)
+
+    if role_name != "bins" and role.signed == EMPTY_BIN.signed:
+        role.signatures = dict(EMPTY_BIN.signatures)
+    else:
+        signer = signers["bins"] if role_name == "bins" else signers["bin-n"]
+        role.sign(signer)
+
     role.to_file(filepath, serializer=PRETTY)
+
+
+# Each role is signed and written independently of all others, so we fan out
+# the work over a pool of threads. The crypto backend and file I/O release the
+# GIL, so threads can overlap that work without having to pickle metadata to
+# other processes. Results are consumed to re-raise any errors.
+with ThreadPoolExecutor() as executor:
+    list(executor.map(_sign_and_persist, roles.keys(), roles.values()))
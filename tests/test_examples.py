@@ -11,9 +11,10 @@ import sys
 import tempfile
 import unittest
 from pathlib import Path
-from typing import ClassVar, List
+from typing import Any, ClassVar, Dict, List
 
 from tests import utils
+from tuf.api.metadata import Metadata
 
 
 class TestRepoExamples(unittest.TestCase):
@@ -47,16 +48,17 @@ class TestRepoExamples(unittest.TestCase):
 
     def _run_script_and_assert_files(
         self, script_name: str, filenames_created: List[str]
-    ) -> None:
+    ) -> Dict[str, Any]:
         """Run script in 'repo_example' dir and assert that it created the
         files corresponding to the passed filenames inside a 'tmp*' test dir at
-        CWD."""
+        CWD. Return the global namespace of the script after running it."""
         script_path = str(self.repo_examples_dir / script_name)
+        script_globals: Dict[str, Any] = {"__file__": script_path}
         with open(script_path, "rb") as f:
             # pylint: disable=exec-used
             exec(
                 compile(f.read(), script_path, "exec"),
-                {"__file__": script_path},
+                script_globals,
             )
 
         test_dirs = glob.glob("tmp*")
@@ -71,6 +73,8 @@ class TestRepoExamples(unittest.TestCase):
                 metadata_path.exists(), f"missing '{metadata_path}' file"
             )
 
+        return script_globals
+
     def test_basic_repo(self) -> None:
         """Run 'basic_repo.py' and assert creation of metadata files."""
         self._run_script_and_assert_files(
@@ -89,7 +93,7 @@ class TestRepoExamples(unittest.TestCase):
 
     def test_hashed_bin_delegation(self) -> None:
         """Run 'hashed_bin_delegation.py' and assert creation of metadata files."""
-        self._run_script_and_assert_files(
+        script_globals = self._run_script_and_assert_files(
             "hashed_bin_delegation.py",
             [
                 "1.bins.json",
@@ -128,6 +132,29 @@ class TestRepoExamples(unittest.TestCase):
             ],
         )
 
+        # Assert that all bins, including those with reused signatures of an
+        # empty bin, are correctly signed for the delegating bins role
+        test_dir = glob.glob("tmp*")[0]
+        bins = Metadata.from_file(os.path.join(test_dir, "1.bins.json"))
+        assert bins.signed.delegations is not None
+        assert bins.signed.delegations.roles is not None
+        for bin_name in bins.signed.delegations.roles:
+            bin_path = os.path.join(test_dir, f"1.{bin_name}.json")
+            bins.verify_delegate(bin_name, Metadata.from_file(bin_path))
+
+        # Assert that bulk and single classification of str, bytes and
+        # bytearray target paths agree with each other
+        find_hash_bin = script_globals["find_hash_bin"]
+        find_hash_bins = script_globals["find_hash_bins"]
+        path = "repo_example/hashed_bin_delegation.py"
+        self.assertEqual(find_hash_bin(path), "80-87")
+        self.assertEqual(find_hash_bin(path.encode()), "80-87")
+        self.assertEqual(find_hash_bin(bytearray(path.encode())), "80-87")
+        self.assertEqual(
+            find_hash_bins([path, path.encode(), bytearray(path.encode())]),
+            [find_hash_bin(path)] * 3,
+        )
+
     def test_succinct_hash_bin_delegation(self) -> None:
         self._run_script_and_assert_files(
             "succinct_hash_bin_delegations.py",